@@ -0,0 +1,302 @@
+# irwin_bench.py
+# à lancer via par exemple :
+
+# sage -python irwin_bench.py --versions v3 v5 --k 0 1 --nbdigits 200 1000
+# sage -python irwin_bench.py --output new.json --baseline old.json
+
+"""Benchmarks of irwin() and irwinpos() across the versions of the code.
+
+Each case of the grid (version, function, b, d, k, nbdigits, level,
+PrecStep, workers) is run in a fresh process, which sets the number
+of workers (maxworkers, or numworkers for the v6dev variants), loads
+irwin_<version>.sage and calls the function with showtimes=True.
+Each line printed is timestamped, and the time from one section
+header (such as "Préparation des RealField...") to the next one is
+attributed to the phase of this header, see _PHASES.  For
+irwin_v3.sage the beta(m+1)'s are computed within the final sum.
+
+The results are emitted as JSON.  The values of irwin(10, 9, 0, N)
+are checked against the k_prec_2+N files, and the other ones against
+the value of the first version of the same case.  With --baseline,
+the wall times are compared to those of a previous output, and a
+case is flagged as a regression if it is slower by more than the
+tolerance.  The exit status is 1 if there are regressions or wrong
+values.
+"""
+
+import argparse
+import contextlib
+import decimal
+import itertools
+import json
+import os
+import platform
+import re
+import subprocess
+import sys
+import time
+
+_HERE = os.path.dirname(os.path.abspath(__file__))
+
+_DEFAULT_VERSIONS = ["v3", "v5", "v6dev_executor", "v6dev_mp"]
+
+# The section headers of the showtimes output and their phases.
+_PHASES = [
+    (re.compile(r"^Préparation des RealField"), "realfields"),
+    (re.compile(r"gammas"), "gammas"),
+    (re.compile(r"^Calcul des (coefficients )?[uv]_"), "recurrence"),
+    (re.compile(r"^Calcul des blocs d'entiers"), "blocks"),
+    (re.compile(r"beta\(m\+1\)"), "betas"),
+    (re.compile(r"^Calcul (des sommes harmoniques|de l'approximation"
+                r"|de la série)"), "sum"),
+]
+
+# The keys of a case, in the order of the grid.
+_KEYS = ("version", "fn", "b", "d", "k", "nbdigits", "level", "PrecStep",
+         "workers")
+
+
+class _TimestampedLines:
+    """File-like object recording the start time of each line."""
+
+    def __init__(self):
+        self.lines = []
+        self._newline = True
+
+    def write(self, s):
+        for piece in s.splitlines(keepends=True):
+            if self._newline:
+                self.lines.append([time.perf_counter(), ""])
+            self.lines[-1][1] += piece
+            self._newline = piece.endswith("\n")
+        return len(s)
+
+    def flush(self):
+        pass
+
+
+def _phase_times(lines, stoptime):
+    """The time spent in each phase, from the timestamped lines."""
+    phases = {}
+    headers = []
+    for starttime, text in lines:
+        if text.startswith("..."):
+            continue
+        for pattern, phase in _PHASES:
+            if pattern.search(text):
+                break
+        else:
+            phase = "other"
+        headers.append((starttime, phase))
+    for (starttime, phase), (endtime, _) in zip(
+            headers, headers[1:] + [(stoptime, None)]):
+        phases[phase] = phases.get(phase, 0) + endtime - starttime
+    return phases
+
+
+def _run_case(case):
+    """Runs one case in this process and returns its measurements."""
+    from sage.all import Integer
+    from sage.repl.load import load
+    # The file is loaded in the namespace of __main__, as in a Sage
+    # session, so that the workers of the v6dev variants can unpickle
+    # its procedures.
+    g = sys.modules["__main__"].__dict__
+    exec("from sage.all import *", g)
+    g["maxworkers"] = g["numworkers"] = Integer(case["workers"])
+    with contextlib.redirect_stdout(open(os.devnull, "w")):
+        load(os.path.join(_HERE, f"irwin_{case['version']}.sage"), g)
+    fn = g[case["fn"]]
+    out = _TimestampedLines()
+    starttime = time.perf_counter()
+    with contextlib.redirect_stdout(out):
+        value = fn(Integer(case["b"]), Integer(case["d"]),
+                   Integer(case["k"]), Integer(case["nbdigits"]),
+                   level=Integer(case["level"]),
+                   PrecStep=Integer(case["PrecStep"]),
+                   showtimes=True)
+    stoptime = time.perf_counter()
+    return dict(wall=stoptime - starttime,
+                phases=_phase_times(out.lines, stoptime),
+                value=str(value),
+                code_version=g.get("__version__"))
+
+
+def _spawn_case(case, timeout):
+    """Runs one case in a fresh process, returns its measurements."""
+    try:
+        proc = subprocess.run([sys.executable, os.path.abspath(__file__),
+                               "--run", json.dumps(case)],
+                              capture_output=True, text=True,
+                              timeout=timeout, cwd=_HERE)
+    except subprocess.TimeoutExpired:
+        return dict(error=f"timeout ({timeout}s)")
+    if proc.returncode != 0:
+        return dict(error=proc.stderr.strip().splitlines()[-1:])
+    return json.loads(proc.stdout.strip().splitlines()[-1])
+
+
+def _agreement(x, y, nbdigits):
+    """The number of significant digits to which x and y agree.
+
+    The decimal strings x and y are compared as numbers, i.e. this is
+    the floor of -log10(|x-y|/|y|), or nbdigits if they are equal.
+    Also returns whether x is y rounded to nbdigits significant
+    digits up to one unit of the last place.
+    """
+    with decimal.localcontext() as ctx:
+        ctx.prec = max(len(x), len(y)) + 10
+        x, y = decimal.Decimal(x), decimal.Decimal(y)
+        if x == y:
+            return nbdigits, True
+        diff = abs(x - y)
+        agree = min(nbdigits, int((-(diff / abs(y)).log10()).to_integral_value(
+            decimal.ROUND_FLOOR)))
+        ulp = decimal.Decimal(10) ** (y.adjusted() - nbdigits + 1)
+        return agree, diff <= ulp
+
+
+def _reference(case):
+    """The reference value for the case, from a k_prec_2+N file, or None.
+
+    These files hold irwin(10, 9, 0) correctly rounded to N decimals.
+    """
+    if (case["fn"], case["b"], case["d"], case["k"]) != ("irwin", 10, 9, 0):
+        return None
+    best = None
+    for name in os.listdir(_HERE):
+        match = re.fullmatch(r"k_prec_2\+(\d+)", name)
+        if match and int(match.group(1)) + 2 >= case["nbdigits"]:
+            if best is None or int(match.group(1)) < best[0]:
+                best = (int(match.group(1)), name)
+    if best is None:
+        return None
+    with open(os.path.join(_HERE, best[1])) as f:
+        return f.read().strip()
+
+
+def _check(results):
+    """Adds to each result the check of its value.
+
+    The value must agree with the reference, or else with the value
+    of the first version for the same case, up to one unit of the
+    last place.
+    """
+    first = {}
+    for result in results:
+        if "value" not in result:
+            continue
+        case = tuple(result[key] for key in _KEYS[1:])
+        reference = _reference(result)
+        against = "k_prec_2+N"
+        if reference is None:
+            against = first.setdefault(case, result)["version"]
+            reference = first[case]["value"]
+        agree, ok = _agreement(result["value"], reference,
+                               result["nbdigits"])
+        result["check"] = dict(against=against, agree=agree, ok=ok)
+
+
+def _compare(results, baseline, tolerance, slack):
+    """Returns the regressions with respect to the baseline results."""
+    old = {tuple(r[key] for key in _KEYS): r for r in baseline["results"]
+           if "wall" in r}
+    regressions = []
+    for result in results:
+        previous = old.get(tuple(result[key] for key in _KEYS))
+        if previous is None or "wall" not in result:
+            continue
+        result["baseline_wall"] = previous["wall"]
+        if result["wall"] > previous["wall"] * (1 + tolerance) + slack:
+            regression = {key: result[key] for key in _KEYS}
+            regression.update(wall=result["wall"],
+                              baseline_wall=previous["wall"],
+                              phases={phase: (t, previous["phases"].get(phase))
+                                      for phase, t in result["phases"].items()})
+            regressions.append(regression)
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Benchmarks of irwin() and irwinpos().")
+    parser.add_argument("--run", help=argparse.SUPPRESS)
+    parser.add_argument("--versions", nargs="+", default=_DEFAULT_VERSIONS,
+                        help="suffixes of the irwin_<version>.sage files")
+    parser.add_argument("--fn", nargs="+", default=["irwin"],
+                        choices=["irwin", "irwinpos"])
+    parser.add_argument("--b", nargs="+", type=int, default=[10])
+    parser.add_argument("--d", nargs="+", type=int, default=[9])
+    parser.add_argument("--k", nargs="+", type=int, default=[0, 2])
+    parser.add_argument("--nbdigits", nargs="+", type=int,
+                        default=[100, 500])
+    parser.add_argument("--level", nargs="+", type=int, default=[3])
+    parser.add_argument("--PrecStep", nargs="+", type=int, default=[500])
+    parser.add_argument("--workers", nargs="+", type=int, default=[8])
+    parser.add_argument("--repeat", type=int, default=1,
+                        help="runs per case, the fastest one is kept")
+    parser.add_argument("--timeout", type=float, default=3600,
+                        help="seconds allowed per run")
+    parser.add_argument("--baseline", help="JSON output of a previous run")
+    parser.add_argument("--tolerance", type=float, default=0.10,
+                        help="allowed relative slowdown")
+    parser.add_argument("--slack", type=float, default=0.05,
+                        help="allowed absolute slowdown in seconds")
+    parser.add_argument("--output", help="file for the JSON output")
+    args = parser.parse_args(argv)
+
+    if args.run is not None:
+        print(json.dumps(_run_case(json.loads(args.run))))
+        return 0
+
+    results = []
+    grid = itertools.product(args.versions, args.fn, args.b, args.d, args.k,
+                             args.nbdigits, args.level, args.PrecStep,
+                             args.workers)
+    for values in grid:
+        case = dict(zip(_KEYS, values))
+        if not 0 <= case["d"] < case["b"]:
+            continue
+        runs = [_spawn_case(case, args.timeout) for _ in range(args.repeat)]
+        timed = [run for run in runs if "wall" in run]
+        result = dict(case)
+        result.update(min(timed, key=lambda run: run["wall"])
+                      if timed else runs[0])
+        print(" ".join(f"{key}={case[key]}" for key in _KEYS),
+              f"{result['wall']:.3f}s" if timed else result["error"],
+              file=sys.stderr)
+        results.append(result)
+    _check(results)
+
+    report = dict(date=time.strftime("%Y-%m-%d %H:%M:%S"),
+                  machine=dict(node=platform.node(),
+                               processor=platform.processor(),
+                               machine=platform.machine(),
+                               cpus=os.cpu_count(),
+                               python=platform.python_version()),
+                  results=results)
+    if args.baseline is not None:
+        with open(args.baseline) as f:
+            report["regressions"] = _compare(results, json.load(f),
+                                             args.tolerance, args.slack)
+    text = json.dumps(report, indent=1, ensure_ascii=False)
+    if args.output is not None:
+        with open(args.output, "w") as f:
+            f.write(text + "\n")
+    else:
+        print(text)
+
+    failed = [r for r in results if not r.get("check", {}).get("ok", False)]
+    for result in failed:
+        print("ÉCHEC :", " ".join(f"{key}={result[key]}" for key in _KEYS),
+              result.get("check", result.get("error")), file=sys.stderr)
+    for regression in report.get("regressions", []):
+        print("RÉGRESSION :",
+              " ".join(f"{key}={regression[key]}" for key in _KEYS),
+              f"{regression['wall']:.3f}s > {regression['baseline_wall']:.3f}s",
+              file=sys.stderr)
+    return 1 if failed or report.get("regressions") else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,735 @@
+# -*- mode: python ; coding: utf-8; -*-
+
+# irwin_v5_gmpy2.py
+# Use via "from irwin_v5_gmpy2 import irwin, irwinpos" in any Python
+# with gmpy2 installed (SageMath is not needed).
+
+__version__  = "1.5.7"
+__date__     = "2025/05/17"
+__filename__ = "irwin_v5_gmpy2.py"
+
+irwin_v5_gmpy2_docstring = """
+This file is a port of irwin_v5.sage to plain Python on top of gmpy2
+(i.e. MPFR, as are the RealField's of SageMath).  It has the same
+algorithmic structure:
+
+- decreasing precision for the higher terms of the series, by
+  multiples of PrecStep bits (the RealField's are replaced by their
+  precisions),
+
+- the blocks of integers with at most level digits, sorted according
+  to the number of occurrences of the digit d,
+
+- the beta(m+1)'s, with the pruning of negligible terms,
+
+- the recurrences for the u_{j;m}'s and v_{j;m}'s, by bunches of
+  maxworkers consecutive m's,
+
+and the operations are done in the same order and with the same
+roundings, so that (for the same maxworkers) the results are the
+same as those of irwin_v5.sage.
+
+The differences are:
+
+- No SageMath startup and no preparsing: importing this module takes
+  a few milliseconds.  The multiprocessing module is only imported if
+  maxworkers is at least 2.
+
+- maxworkers is an argument of irwin() and irwinpos(), not a
+  global to set before loading.  It is both the size of the bunches
+  of the recurrence and the number of worker processes (forked), and
+  maxworkers=1 means no worker processes at all.  With maxworkers=8
+  (the default) the results are bitwise identical to those of
+  irwin_v5.sage with its default maxworkers.
+
+- Only the default computation paths of irwin_v5.sage are provided
+  (recurrence="parallel", beta="powers"), and the recurrence goes
+  to worker processes only for m>400, as for smaller m's the
+  computation is too fast for forking to pay off.
+
+- The results are gmpy2.mpfr's.
+
+Other than in a Python session, it can be used from the command line:
+
+    python irwin_v5_gmpy2.py b d k [nbdigits [level]]
+"""
+
+import math
+import pickle
+import time
+
+import gmpy2
+from gmpy2 import mpfr
+
+nbguardbits = 12
+
+irwin_v5_gmpy2_fn_docstring = """:param int b: the integer base
+    :param int d: the digit.
+    :param int k: the number of occurrences.
+    :param int nbdigits: (optional, default 34)
+        The wished-for number of decimal digits for the result.
+    :param int level: (optional, default 3)
+        The level of the Burnol algorithm, at least 2.
+    :param int PrecStep: (optional, default 500)
+        The {0}'s and beta(m+1)'s are computed with precisions
+        decreasing with m by multiples of PrecStep bits.
+    :param bool all: (optional, default ``False``)
+        Whether to compute and print the sums for all j's from 0 to k.
+    :param bool showtimes: (optional, default ``False``)
+        Whether to print timings.
+    :param int Mmax: (optional, default ``-1``)
+        The number of terms of the series to use.  The default is
+        the number computed to reach the precision.
+    :param bool prunebeta: (optional, default ``True``)
+        Whether to skip the terms of the beta(m+1)'s which are
+        negligible at their precision.
+    :param int maxworkers: (optional, default 8)
+        The size of the bunches of m's for the recurrences and the
+        number of worker processes.  With 1, nothing is done in
+        worker processes.
+
+    :rtype: :class:`gmpy2.mpfr`
+    :return: la somme d'Irwin de hauteur k pour le chiffre d en base b.
+
+    Example:
+    --------
+
+    >>> print(_v5_str({1}(10, 9, 4, 52, all=True), 52))
+    (k=0) 22.92067661926415034816365709437593191494476243699848
+    (k=1) 23.04428708074784831967594930973617482538959203064774
+    (k=2) 23.02604026596124378845022249787272342108112267542086
+    (k=3) 23.02585299837244431714290384468012275518705238435290
+    (k=4) 23.02585095265829261377053973815542996035002267989413
+    23.02585095265829261377053973815542996035002267989413
+"""
+
+
+def _fillin_irwin_docstring():
+    def _fillin(fn):
+        fn.__doc__ = fn.__doc__.format(
+            irwin_v5_gmpy2_fn_docstring.format(
+                "u_{j;m}" if fn.__name__ == "irwin" else "v_{j;m}",
+                fn.__name__))
+        return fn
+    return _fillin
+
+
+def _v5_str(x, nbdigits):
+    """String of x rounded to nbdigits significant decimal digits.
+
+    This is the format used by SageMath for the RealField's of the
+    final precision of irwin() and irwinpos() (the trailing zeros
+    are kept).
+    """
+    digits, e, _ = gmpy2.digits(x, 10, nbdigits)
+    sign = ""
+    if digits[0] == "-":
+        sign, digits = "-", digits[1:]
+    if x == 0:
+        return "0." + "0" * (nbdigits - 1)
+    if 0 < e <= nbdigits:
+        return sign + digits[:e] + "." + digits[e:]
+    if -6 < e <= 0:
+        return sign + "0." + "0" * (-e) + digits
+    return sign + digits[0] + "." + digits[1:] + f"e{e - 1}"
+
+
+def _v5_setup_precisions(nbdigits, PrecStep, b, level, Mmax=-1):
+    """Preparation of an array mapping each m to a precision.
+
+    This is _v5_setup_realfields() of irwin_v5.sage, with the
+    precisions (in bits) in place of the RealField's.  See
+    irwin_v5_doc.pdf for mathematical details.  The floor's and
+    ceil's of the real numbers involved are obtained using 256 bits,
+    which is plenty: they are either irrational (log(b,2) is) or
+    exact at this precision.
+    """
+    with gmpy2.context(gmpy2.get_context(), precision=256):
+        log2b = gmpy2.log2(b)
+        nbbits_final = int(gmpy2.ceil((nbdigits + 1) * gmpy2.log2(10)))
+        nbbits = nbbits_final + nbguardbits
+        # floor((nbbits - nbguardbits/2)/(level-1)/log(b,2))
+        _Mmax = int(gmpy2.floor(mpfr(2 * nbbits - nbguardbits)
+                                / (2 * (level - 1)) / log2b))
+        NbOfPrec = 1 + (2 * nbbits - nbguardbits) // (2 * PrecStep)
+        LesPrecs = [nbbits - j * PrecStep for j in range(NbOfPrec)]
+        # The m's using LesPrecs[j] are those with
+        # ceil(j*T/(l-1)/log(b,2))<= m < ceil((j+1)*T/(l-1)/log(b,2)).
+        IndexToPrecRatio = mpfr(PrecStep) / (level - 1) / log2b
+        IndexToPrec = []
+        oldindexbound = 0
+        for j in range(NbOfPrec):
+            newindexbound = int(gmpy2.ceil((j + 1) * IndexToPrecRatio))
+            IndexToPrec.extend([LesPrecs[j]] * (newindexbound - oldindexbound))
+            oldindexbound = newindexbound
+
+    # m=1 uses always maximal precision.
+    IndexToPrec[1] = nbbits
+    IndexToPrec.extend([LesPrecs[-1]] * (_Mmax + 1 - len(IndexToPrec)))
+
+    if Mmax == -1:
+        Mmax = _Mmax
+    elif Mmax > _Mmax:
+        IndexToPrec.extend([LesPrecs[-1]] * (Mmax - _Mmax))
+        print(f"!!!! Warning Mmax={Mmax} is probably needlessly big.")
+        print(f"!!!! {_Mmax} should be enough but we will use your value.")
+
+    return nbbits, nbbits_final, Mmax, IndexToPrec, NbOfPrec
+
+
+def _v5_setup_blocks(b, d, level):
+    """Organize integers according to nb of digits and d-count.
+
+    blocks[l][j] is the list of integers having (l+1) digits in radix
+    b, among whose exactly j are equal to d, for l+1 at most level.
+    Same as in irwin_v5.sage.
+    """
+    # A is the list of digits (inclusive of 0) not equal to d.
+    A = [i for i in range(b)]
+    A.remove(d)
+
+    block1 = [[a for a in A if a != 0], [] if d == 0 else [d]]
+    blocks = [block1]
+
+    for l in range(1, level):
+        prev = blocks[-1]
+        block = [[b * x + a for x in prev[0] for a in A]]
+        for j in range(1, l + 1):
+            L = [b * x + d for x in prev[j - 1]]
+            L.extend([b * x + a for x in prev[j] for a in A])
+            block.append(L)
+        # The integer with all its l+1 digits equal to d.
+        block.append([] if d == 0 else [(b ** (l + 1) - 1) // (b - 1) * d])
+        blocks.append(block)
+
+    return blocks
+
+
+def _v5_pascal_row(m):
+    """Row m of the Pascal triangle via the multiplicative formula.
+    """
+    row = [1]
+    for i in range(1, m // 2 + 1):
+        row.append(row[-1] * (m - i + 1) // i)
+    row.extend(reversed(row[:(m + 1) // 2]))
+    return row
+
+
+# Data inherited by the forked worker processes.
+_v5_shared = {}
+
+
+def _v5_map(task, args, maxworkers):
+    """Returns the list of the task(x) for x in args.
+
+    They are computed by forked worker processes if maxworkers is at
+    least 2, which inherit the data set in _v5_shared.  If forking is
+    not available on this system, they are computed serially.
+    """
+    if maxworkers >= 2 and len(args) >= 2:
+        import multiprocessing
+        try:
+            ctx = multiprocessing.get_context("fork")
+        except ValueError:
+            ctx = None
+        if ctx is not None:
+            with ctx.Pool(min(maxworkers, len(args))) as pool:
+                return pool.map(task, args, chunksize=1)
+    return [task(x) for x in args]
+
+
+def _v5_setup_operands(touslescoeffs, Gammas, PuissancesDeD):
+    """Set up per precision tables of pre-rounded operands.
+
+    See _v5_setup_operands() in irwin_v5.sage.  Returns operands(p, m)
+    giving lists G, D, T such that G[i] and D[i] are Gammas[i] and
+    PuissancesDeD[i] rounded to p bits for i<=m and T[n] is
+    touslescoeffs[n] rounded to p bits for n<m (if this row is
+    already known).  The tables for higher precisions than the last
+    one asked for are forgotten.
+    """
+    tiers = {}
+
+    def operands(p, m):
+        for q in [q for q in tiers if q > p]:
+            del tiers[q]
+        tier = tiers.get(p)
+        if tier is None:
+            tier = tiers[p] = ([], [], [])
+        G, D, T = tier
+        for i in range(len(G), m + 1):
+            G.append(mpfr(Gammas[i], p))
+            if PuissancesDeD is not None:
+                D.append(mpfr(PuissancesDeD[i], p))
+        for n in range(len(T), min(m, len(touslescoeffs))):
+            T.append([mpfr(x, p) for x in touslescoeffs[n]])
+        return G, D, T
+
+    return operands
+
+
+def _v5_ukm_partial_aux(a, m, Pm, G, D, T, p, k):
+    """Partial recurrences for the u_{j;m}'s or v_{j;m}'s.
+
+    Only the contributions of the index i from a to m are summed,
+    i.e. those using rows touslescoeffs[m-i] which were known before
+    the current bunch of m's.  Pm is the row m of the Pascal
+    triangle and G, D, T are rounded to p bits.  Formulas of
+    Theorem 1 and Theorem 4 of arXiv:2402.09083v5, up to the
+    division by b**(m+1)-b+1.
+    """
+    gmpy2.get_context().precision = p
+    # The weights do not depend on j, so we compute them only once.
+    WG = [mpfr(Pm[i], p) * G[i] for i in range(a, m + 1)]
+    A = list(sum(w * T[m - i][j] for i, w in zip(range(a, m + 1), WG))
+             for j in range(k + 1))
+    B = [ 0 ]
+    if k > 0:
+        WD = [mpfr(Pm[i], p) * D[i] for i in range(a, m + 1)]
+        B.extend(sum(w * T[m - i][j-1] for i, w in zip(range(a, m + 1), WD))
+                 for j in range(1, k + 1))
+    return [ A[j] + B[j] for j in range(k + 1) ]
+
+
+def _v5_pool_worker(conn, Gammas, PuissancesDeD, IndexToPrec, T, k):
+    """Main loop of a long-lived worker of _v5_setup_pool().
+
+    The worker is forked with a replica T of touslescoeffs, and
+    afterwards it only receives the newly finalized rows.  It keeps
+    its own tables of operands rounded to the current precision, see
+    _v5_setup_operands(), and computes itself the needed row of the
+    Pascal triangle.
+    """
+    operands = _v5_setup_operands(T, Gammas, PuissancesDeD)
+    while True:
+        message = pickle.loads(conn.recv_bytes())
+        if message[0] == "rows":
+            T.extend(message[1])
+        elif message[0] == "partial":
+            a, m = message[1], message[2]
+            p = IndexToPrec[m]
+            G, D, Tm = operands(p, m)
+            result = _v5_ukm_partial_aux(a, m, _v5_pascal_row(m),
+                                         G, D, Tm, p, k)
+            conn.send_bytes(pickle.dumps(result))
+        else:
+            break
+    conn.close()
+
+
+def _v5_setup_pool(touslescoeffs, Gammas, PuissancesDeD, IndexToPrec, k,
+                   nworkers):
+    """Starts nworkers long-lived processes for the recurrence.
+
+    As _v5_setup_pool() in irwin_v5.sage: the processes are forked
+    once, they inherit all the data, and keep their own replica of
+    touslescoeffs.  Before each bunch, only the rows which were added
+    to touslescoeffs since the previous bunch are sent to them, once
+    pickled for all.
+
+    Returns a procedure with arguments M and step which returns the
+    list (with a dummy None at index 0) of the values of
+    _v5_ukm_partial_aux() for m=M+a, a=1, ..., step, and a procedure
+    to call to terminate the workers.  Returns None if forking is
+    not available on this system.
+    """
+    import multiprocessing
+    try:
+        ctx = multiprocessing.get_context("fork")
+    except ValueError:
+        return None
+    connections = []
+    processes = []
+    for w in range(nworkers):
+        parent_conn, child_conn = ctx.Pipe()
+        P = ctx.Process(target=_v5_pool_worker,
+                        args=(child_conn, Gammas, PuissancesDeD,
+                              IndexToPrec, touslescoeffs, k),
+                        daemon=True)
+        P.start()
+        child_conn.close()
+        connections.append(parent_conn)
+        processes.append(P)
+    # Number of rows of touslescoeffs known to the workers.
+    nbrows = [len(touslescoeffs)]
+
+    def ukm_partial(M, step):
+        if len(touslescoeffs) > nbrows[0]:
+            delta = pickle.dumps(("rows", touslescoeffs[nbrows[0]:]))
+            for conn in connections:
+                conn.send_bytes(delta)
+            nbrows[0] = len(touslescoeffs)
+        for a in range(1, step + 1):
+            connections[a - 1].send_bytes(pickle.dumps(("partial", a, M + a)))
+        results = [ None ]
+        results.extend(pickle.loads(conn.recv_bytes())
+                       for conn in connections[:step])
+        return results
+
+    def close():
+        for conn in connections:
+            conn.send_bytes(pickle.dumps(("stop",)))
+            conn.close()
+        for P in processes:
+            P.join()
+
+    return ukm_partial, close
+
+
+def _v5_recurrence(touslescoeffs, Gammas, PuissancesDeD, IndexToPrec,
+                   Mmax, b, k, is_for_vm, maxworkers):
+    """Computes the rows of touslescoeffs for m from 2 to Mmax.
+
+    As _v5_para_recurrence() in irwin_v5.sage, by bunches of
+    maxworkers consecutive m's: the partial recurrences of the m's of
+    a bunch only use rows known before the bunch, and the missing
+    contributions are then added in order of increasing m's.  The
+    partial recurrences are computed for m>400 by the long-lived
+    worker processes of _v5_setup_pool().
+    """
+    bmoinsun = b - 1
+    operands = _v5_setup_operands(touslescoeffs, Gammas, PuissancesDeD)
+    ctx = gmpy2.get_context()
+    # The pool is started at the first bunch with m>400, if forking
+    # is available, and terminated at the end of the recurrence.
+    pool = None
+    usepool = maxworkers >= 2
+    PascalRows = [None, [1, 1]]
+    M = 1
+    try:
+        while M < Mmax:
+            step = min(maxworkers, Mmax - M)
+            PascalRows = [None] + [_v5_pascal_row(M + a)
+                                   for a in range(1, step + 1)]
+            if M > 400 and usepool and pool is None:
+                pool = _v5_setup_pool(touslescoeffs, Gammas, PuissancesDeD,
+                                      IndexToPrec, k, maxworkers)
+                usepool = pool is not None
+            if M > 400 and usepool:
+                ukm_partial = pool[0](M, step)
+            else:
+                ukm_partial = [ None ]
+                for a in range(1, step + 1):
+                    p = IndexToPrec[M + a]
+                    G, D, T = operands(p, M + a)
+                    ukm_partial.append(_v5_ukm_partial_aux(a, M + a,
+                                                           PascalRows[a],
+                                                           G, D, T, p, k))
+
+            # Add the missing contributions in order of increasing m's.
+            for a in range(1, step + 1):
+                m = M + a
+                p = IndexToPrec[m]
+                G, PD, T = operands(p, m)
+                ctx.precision = p
+                WG = [ None ]
+                WG.extend(mpfr(PascalRows[a][i], p) * G[i]
+                          for i in range(1, a))
+                D = mpfr(b**(m+1) - bmoinsun, p)
+                # The b**(m+1) extra term is specific to the v_m recurrence.
+                cm = [ ((mpfr(b ** (m+1), p) if is_for_vm else 0)
+                        + ukm_partial[a][0]
+                        + sum(WG[i] * T[m-i][0] for i in range(1, a))
+                        ) / D
+                      ]
+                if k > 0:
+                    WD = [ None ]
+                    WD.extend(mpfr(PascalRows[a][i], p) * PD[i]
+                              for i in range(1, a))
+                for j in range(1, k+1):
+                    _ = (ukm_partial[a][j]
+                         + sum(WG[i] * T[m-i][j] for i in range(1, a))
+                         + cm[-1]
+                         + sum(WD[i] * T[m-i][j-1] for i in range(1, a))
+                         ) / D
+                    cm.append(_)
+                touslescoeffs.append(cm)
+            M += step
+    finally:
+        if pool is not None:
+            pool[1]()
+
+
+def _v5_beta_cutoff(s, prec, logs, logmin, extra=0):
+    """Number of integers of a sorted block needed for the sum of 1/n**s.
+
+    Same as in irwin_v5.sage: the tail of the terms of index t or
+    more is negligible at precision prec as soon as
+
+        log2(N-t) + s*(logmin-logs[t]) <= -(prec+1+extra),
+
+    and we use one more bit for the roundings of the floats.
+    """
+    N = len(logs)
+    bound = -(prec + 2 + extra)
+    lo, hi = 1, N
+    while lo < hi:
+        t = (lo + hi) // 2
+        if math.log2(N - t) + s * (logmin - logs[t]) <= bound:
+            hi = t
+        else:
+            lo = t + 1
+    return min(lo, N)
+
+
+def _v5_beta_aux(m, p, nblock, logs=None):
+    if logs:
+        nblock = nblock[:_v5_beta_cutoff(m+1, p, logs, logs[0])]
+    gmpy2.get_context().precision = p
+    return sum(1/mpfr(n ** (m+1), p) for n in nblock)
+
+
+def _v5_beta_task(start):
+    """The beta(m+1)'s for the m's congruent to start modulo maxworkers.
+    """
+    IndexToPrec, nblock, logs, Mmax, maxworkers = _v5_shared["beta"]
+    return [_v5_beta_aux(m, IndexToPrec[m], nblock, logs)
+            for m in range(start, Mmax + 1, maxworkers)]
+
+
+def _v5_betas(nblock, IndexToPrec, Mmax, prune, maxworkers):
+    """Returns L such that L[m] is the sum of the 1/n**(m+1) in nblock.
+
+    The m's are split according to their value modulo maxworkers, so
+    that the computation costs are about equal across workers.  If
+    prune is True, the block is sorted and the negligible terms are
+    not computed, see _v5_beta_cutoff().
+    """
+    if prune:
+        nblock = sorted(nblock)
+        logs = [math.log2(n) for n in nblock]
+    else:
+        logs = None
+    _v5_shared["beta"] = (IndexToPrec, nblock, logs, Mmax, maxworkers)
+    results = _v5_map(_v5_beta_task, list(range(1, 1 + maxworkers)),
+                      maxworkers)
+    del _v5_shared["beta"]
+    L = [0] * (Mmax + 1)
+    for start, values in zip(range(1, 1 + maxworkers), results):
+        L[start::maxworkers] = values
+    return L
+
+
+def _v5_irwin(b, d, k, nbdigits, level, PrecStep, all, showtimes, Mmax,
+              prunebeta, maxworkers, is_for_vm):
+    """Shared code of irwin() and irwinpos().
+
+    If is_for_vm is False, the alternating series of irwin() is used
+    with the u_{j;m}'s, otherwise the positive series of irwinpos()
+    with the v_{j;m}'s (whose recurrences use b-1-d in place of d),
+    and the integers of the blocks of beta(m+1)'s are shifted by 1.
+    """
+    assert level > 1, "Le niveau (level) doit être au moins 2"
+    assert b > 1, "%s doit être au moins 2" % b
+    assert 0 <= d < b, "%d doit être positif et au plus b-1" % d
+    assert maxworkers >= 1, "maxworkers doit être au moins 1"
+    bmoinsun = b - 1
+    name = "v" if is_for_vm else "u"
+
+    if showtimes:
+        print("Préparation des précisions...", end=" ", flush=True)
+        starttime = time.perf_counter()
+
+    (nbbits,
+     nbbits_final,
+     Mmax,
+     IndexToPrec,
+     NbOfPrec) = _v5_setup_precisions(nbdigits, PrecStep, b, level, Mmax)
+
+    ctx = gmpy2.get_context()
+
+    if showtimes:
+        stoptime = time.perf_counter()
+        print("{:.3f}s".format(stoptime - starttime))
+        print("Calcul des gammas...", end=" ", flush=True)
+        starttime = time.perf_counter()
+
+    # The positive series has recurrences with b-1-d in place of d.
+    dd = bmoinsun - d if is_for_vm else d
+    A1 = list(range(1, b))
+    if dd != 0:
+        A1.remove(dd)
+    lesgammas = [ bmoinsun ]
+    for m in range(1, Mmax+1):
+        lesgammas.append(mpfr(sum(a**m for a in A1), IndexToPrec[m]))
+    if k > 0:
+        lespuissancesded = [ 1 ]
+        for m in range(1, Mmax+1):
+            lespuissancesded.append(mpfr(dd**m, IndexToPrec[m]))
+    else:
+        lespuissancesded = None
+
+    if showtimes:
+        stoptime = time.perf_counter()
+        print("{:.3f}s".format(stoptime - starttime))
+        if k == 0:
+            print(f"Calcul des {name}_{{0;m}} pour m<={Mmax} ...",
+                  end=" ", flush=True)
+        else:
+            print(f"Calcul des {name}_{{j;m}} pour j<={k} et m<={Mmax} ...",
+                  end=" ", flush=True)
+        starttime = time.perf_counter()
+
+    # touslescoeffs[m][j] is u_{j;m} (or v_{j;m}): m first, j second.
+    ctx.precision = nbbits
+    Rb = mpfr(b, nbbits)
+    touslescoeffs = [ [Rb] * (k+1) ]
+    if is_for_vm:
+        # This b * b extra is needed for the v_{0;1}.
+        c1 = [ (mpfr(b * b, nbbits) + lesgammas[1] * Rb)
+               / mpfr(b * b - bmoinsun, nbbits) ]
+    else:
+        c1 = [ lesgammas[1] * Rb / mpfr(b * b - bmoinsun, nbbits) ]
+    for j in range(1, k+1):
+        c1.append(((lesgammas[1] + mpfr(dd, nbbits)) * Rb + c1[-1])
+                  / mpfr(b * b - bmoinsun, nbbits))
+    touslescoeffs.append(c1)
+
+    _v5_recurrence(touslescoeffs, lesgammas, lespuissancesded,
+                   IndexToPrec, Mmax, b, k, is_for_vm, maxworkers)
+
+    if showtimes:
+        stoptime = time.perf_counter()
+        print("{:.3f}s".format(stoptime - starttime))
+        print("Calcul des blocs d'entiers...", end=" ", flush=True)
+        starttime = time.perf_counter()
+
+    blocks = _v5_setup_blocks(b, d, level)
+    maxblock = blocks[-1]
+    if is_for_vm:
+        # The beta(m+1)'s of the positive series are for the n+1's.
+        maxblock = [[n + 1 for n in L] for L in maxblock]
+
+    if showtimes:
+        stoptime = time.perf_counter()
+        print("{:.3f}s".format(stoptime - starttime))
+        print(f"Calcul des beta(m+1) avec maxworkers={maxworkers} ...",
+              end=" ", flush=True)
+        starttime = time.perf_counter()
+
+    lesbetas = [_v5_betas(maxblock[i], IndexToPrec, Mmax, prunebeta,
+                          maxworkers)
+                for i in range(1 + min(k, level))]
+
+    if showtimes:
+        stoptime = time.perf_counter()
+        print("{:.3f}s".format(stoptime - starttime))
+
+    Sk = []
+    for j in range(0 if all else k, k+1):
+        if showtimes:
+            print(f"Calcul de la série pour k={j}...", end=" ", flush=True)
+            starttime = time.perf_counter()
+
+        # The harmonic sum of the integers with less than level digits
+        # and exactly j occurrences of d.
+        ctx.precision = nbbits
+        S = 0
+        if j == 0:
+            S = sum(1/mpfr(x, nbbits) for x in blocks[0][0])
+        elif j == 1:
+            if d != 0:
+                S = 1/mpfr(d, nbbits)
+        for l in range(1, level - 1):
+            if j <= l + 1:
+                S += sum(1/mpfr(x, nbbits) for x in blocks[l][j])
+
+        # Plus b times the harmonic sum of the integers (shifted by
+        # 1 for the positive series) with level digits and at most j
+        # occurrences of d.
+        S += mpfr(b, nbbits) * (sum(sum(1/mpfr(x, nbbits) for x in maxblock[i])
+                                    for i in range(1 + min(j, level))))
+
+        # The Burnol series, from its smallest terms.
+        ctx.precision = IndexToPrec[Mmax]
+        bubu = touslescoeffs[Mmax][j] * lesbetas[0][Mmax]
+        for i in range(1, 1 + min(j, level)):
+            bubu += touslescoeffs[Mmax][j-i] * lesbetas[i][Mmax]
+        for m in range(Mmax-1, 0, -1):
+            p = IndexToPrec[m]
+            ctx.precision = p
+            bubu = mpfr(bubu if is_for_vm else -bubu, p)
+            bubu += touslescoeffs[m][j] * lesbetas[0][m]
+            for i in range(1, 1 + min(j, level)):
+                bubu += touslescoeffs[m][j-i] * lesbetas[i][m]
+
+        ctx.precision = nbbits
+        S = S + bubu if is_for_vm else S - bubu
+
+        if showtimes:
+            stoptime = time.perf_counter()
+            print("{:.3f}s".format(stoptime - starttime))
+
+        if all:
+            Sk.append(S)
+
+    if all:
+        for j in range(k+1):
+            print(f"(k={j}) {_v5_str(mpfr(Sk[j], nbbits_final), nbdigits)}")
+
+    return mpfr(S, nbbits_final)
+
+
+@_fillin_irwin_docstring()
+def irwin(b, d, k,
+          nbdigits=34,
+          level=3,
+          PrecStep=500,
+          all=False,
+          showtimes=False,
+          Mmax=-1,
+          prunebeta=True,
+          maxworkers=8
+          ):
+    """Somme d'Irwin pour b, d, k avec nbdigits chiffres décimaux (en tout).
+
+    Utilise l'algorithme de Burnol, série alternée de niveau au moins 2.
+
+    {0}
+    """
+    with gmpy2.context(gmpy2.get_context()):
+        return _v5_irwin(b, d, k, nbdigits, level, PrecStep, all,
+                         showtimes, Mmax, prunebeta, maxworkers, False)
+
+
+@_fillin_irwin_docstring()
+def irwinpos(b, d, k,
+             nbdigits=34,
+             level=3,
+             PrecStep=500,
+             all=False,
+             showtimes=False,
+             Mmax=-1,
+             prunebeta=True,
+             maxworkers=8
+             ):
+    """Somme d'Irwin pour b, d, k avec nbdigits chiffres décimaux (en tout).
+
+    Utilise l'algorithme de Burnol, série positive de niveau au moins 2.
+
+    {0}
+    """
+    with gmpy2.context(gmpy2.get_context()):
+        return _v5_irwin(b, d, k, nbdigits, level, PrecStep, all,
+                         showtimes, Mmax, prunebeta, maxworkers, True)
+
+
+if __name__ == "__main__":
+    import sys
+    if len(sys.argv) > 3:
+        args = [int(x) for x in sys.argv[1:]]
+        nbdigits = args[3] if len(args) > 3 else 34
+        print(_v5_str(irwin(*args), nbdigits))
+    else:
+        print(f"""
+Hello, this file {__filename__} provides two functions irwin()
+and irwinpos().  Use help(irwin) or help(irwinpos) for help.
+
+This is version {__version__} of {__date__}.
+
+General information is also available in the irwin_v5_gmpy2_docstring
+variable.
+
+From the command line: python {__filename__} b d k [nbdigits [level]]
+"""
+              )
@@ -0,0 +1,228 @@
+# -*- mode: python ; coding: utf-8; -*-
+
+"""This module computes Irwin sums using floats for whole grids of (b, d, k)
+
+Documentation is in French.
+
+Ce fichier définit une procédure irwinfloatgrid() qui calcule avec les
+mêmes algorithmes (série alternée ou positive de Burnol, de niveau 2)
+que irwinfloat() et irwinposfloat() de irwinfloat_legacy.py, mais pour
+tous les chiffres d de toutes les bases b d'une liste et tous les k
+jusqu'à K d'un coup, à l'aide de tableaux NumPy :
+
+- la récurrence pour les moments est menée simultanément pour toutes
+  les paires (b, d) ayant le même nombre de termes Mmax, et pour tous
+  les j <= K,
+
+- les sommes des 1/n**(m+1) sur les blocs d'entiers à deux chiffres
+  (suivant le nombre d'occurrences de d) sont obtenues pour tous les d
+  et tous les m à la fois.
+
+Exécuter en ligne de commande
+
+    python -i irwinfloat_grid.py
+
+et suivre les instructions... (voir au bas du fichier)
+
+"""
+
+__version__ = "1.0.0"
+__license__ = "CC BY-SA 4.0 https://creativecommons.org/licenses/by-sa/4.0/"
+
+from math import log10, ceil, comb
+
+import numpy as np
+
+
+def _mmax(b, positive):
+    """Nombre de termes utilisés par irwinfloat() ou irwinposfloat()"""
+    # +1 (resp. +2) de sécurité, voir irwinfloat_legacy.py
+    return ceil(15/log10(b)) + (2 if positive else 1)
+
+
+def _betas(b, Mmax, positive):
+    """Sommes des 1/n**(m+1) sur les blocs de niveau 2, pour tous les d
+
+    Renvoie un tableau beta de forme (b, 3, Mmax+1) tel que beta[d, i, m]
+    est la somme des 1/n**(m+1) (des 1/(n+1)**(m+1) si positive est True)
+    pour les entiers n à deux chiffres en base b dont exactement i sont
+    égaux à d.  Pour m=0 ce sont les sommes harmoniques de ces blocs.
+
+    Avec X[h-1, l] = 1/(b*h+l+shift)**(m+1), les sommes par ligne et par
+    colonne donnent les blocs à chiffre de tête ou chiffre des unités
+    fixé, et la diagonale le bloc des nombres dd ; le reste s'obtient
+    par inclusion-exclusion.
+    """
+    shift = 1 if positive else 0
+    n = (b * np.arange(1, b)[:, None] + np.arange(b)[None, :] + shift)
+    s = np.arange(1, Mmax + 2, dtype=float)
+    X = np.power(n[None, :, :].astype(float), -s[:, None, None])
+    total = X.sum(axis=(1, 2))                    # (Mmax+1,)
+    rows = np.zeros((Mmax + 1, b))                # chiffre de tête = d
+    rows[:, 1:] = X.sum(axis=2)
+    cols = X.sum(axis=1)                          # chiffre des unités = d
+    diag = np.zeros((Mmax + 1, b))                # les deux chiffres = d
+    diag[:, 1:] = X[:, np.arange(b - 1), np.arange(1, b)]
+    beta = np.empty((b, 3, Mmax + 1))
+    beta[:, 2, :] = diag.T
+    beta[:, 1, :] = (rows + cols - 2 * diag).T
+    beta[:, 0, :] = (total[:, None] - rows - cols + diag).T
+    return beta
+
+
+def _moments(B, Dd, K, Mmax, positive):
+    """Récurrence des u_{j;m} (ou v_{j;m}) pour des paires (b, d)
+
+    B et Dd sont des tableaux d'entiers de même longueur P, Dd étant le
+    chiffre d (ou b-1-d pour la série positive).  Renvoie u de forme
+    (P, K+1, Mmax+1) avec u[p, j, m] = u_{j;m} pour la paire p.  Les
+    sommes sur i sont faites pour tous les j à la fois, seul le terme
+    i=0 (qui fait intervenir u_{j-1;m}) impose une boucle sur j.
+    """
+    P = len(B)
+    Bf = B.astype(float)
+    # Les gammas exacts en entiers puis arrondis, comme dans
+    # irwinfloat(), sans quoi la soustraction de d**m serait ruineuse
+    # pour d=b-1 et m grand.
+    gammas = np.empty((P, Mmax + 1))
+    sumpowers = {}
+    for p, (b, d) in enumerate(zip(B.tolist(), Dd.tolist())):
+        if b not in sumpowers:
+            sumpowers[b] = [sum(a**m for a in range(1, b))
+                            for m in range(Mmax + 1)]
+        gammas[p] = [float(S - (d**m if d else 0))
+                     for m, S in enumerate(sumpowers[b])]
+    powd = np.power(Dd.astype(float)[:, None],
+                    np.arange(Mmax + 1, dtype=float)[None, :])
+    Pascal = np.array([[comb(m, i) for i in range(Mmax + 1)]
+                       for m in range(Mmax + 1)], dtype=float)
+
+    u = np.zeros((P, K + 1, Mmax + 1))
+    u[:, :, 0] = Bf[:, None]
+    for m in range(1, Mmax + 1):
+        Den = Bf ** (m + 1) - (Bf - 1)
+        # i = 1, ..., m et u[..., m-i] pour m-i = m-1, ..., 0
+        prev = u[:, :, m - 1::-1] if m > 1 else u[:, :, :1]
+        WG = Pascal[m, 1:m + 1] * gammas[:, 1:m + 1]
+        A = np.einsum('pi,pji->pj', WG, prev)
+        if K > 0:
+            WD = Pascal[m, 1:m + 1] * powd[:, 1:m + 1]
+            A[:, 1:] += np.einsum('pi,pji->pj', WD, prev[:, :K, :])
+        if positive:
+            # terme additionnel pour la récurrence des v_{0;m}
+            A[:, 0] += Bf ** (m + 1)
+        u[:, 0, m] = A[:, 0] / Den
+        for j in range(1, K + 1):
+            u[:, j, m] = (A[:, j] + u[:, j - 1, m]) / Den
+    return u
+
+
+def irwinfloatgrid(bases, K, positive=False, Mmax=-1):
+    """Calcule les sommes d'Irwin en floats pour toute une grille de (b, d, k)
+
+    Utilise algorithme de Burnol, série alternée (ou positive) de
+    niveau 2, comme irwinfloat() (ou irwinposfloat()).
+
+    :param bases: liste d'int
+        les bases
+    :param K: int
+        le plus grand nombre d'occurrences k
+    :param positive: bool,optional (False)
+        si True, utilise la série positive (comme irwinposfloat()) et
+        non pas la série alternée
+    :param Mmax: int,optional (-1)
+        si positif ou nul, donne le nombre de termes de la série de Burnol
+        à utiliser (pour toutes les bases)
+    :rtype: dict
+    :return: S tel que S[b][d][k] est la somme d'Irwin de hauteur k pour
+        le chiffre d en base b ; S[b] est un tableau NumPy de forme
+        (b, K+1).
+
+    Les paires (b, d) sont regroupées suivant leur nombre de termes Mmax
+    et la récurrence est menée pour chaque groupe simultanément.
+    """
+    bases = sorted(set(bases))
+    for b in bases:
+        assert b > 1, "%s doit être au moins 2" % b
+    assert K >= 0, "%s doit être positif" % K
+
+    groups = {}
+    for b in bases:
+        groups.setdefault(Mmax if Mmax >= 0 else _mmax(b, positive),
+                          []).append(b)
+
+    S = {}
+    for M, groupbases in groups.items():
+        B = np.concatenate([np.full(b, b) for b in groupbases])
+        D = np.concatenate([np.arange(b) for b in groupbases])
+        # ATTENTION que la série positive a des récurrences avec b-1-d
+        # à la place de d
+        u = _moments(B, B - 1 - D if positive else D, K, M, positive)
+        start = 0
+        for b in groupbases:
+            ub = u[start:start + b]                       # (b, K+1, M+1)
+            start += b
+            beta = _betas(b, M, positive)                 # (b, 3, M+1)
+            d = np.arange(b)
+            # sommes du niveau 1 : les chiffres non nuls autres que d
+            # pour j=0, le chiffre d (s'il n'est pas nul) pour j=1
+            H1 = np.zeros((b, K + 1))
+            inv = np.zeros(b)
+            inv[1:] = 1 / d[1:]
+            H1[:, 0] = inv.sum() - inv
+            if K >= 1:
+                H1[:, 1] = inv
+            # puis b fois la somme harmonique des nombres à deux chiffres
+            # (décalés de 1 pour la série positive) ayant au plus j
+            # occurrences de d
+            H2 = np.cumsum(beta[:, :, 0], axis=1)         # (b, 3)
+            Sb = H1 + b * H2[:, np.minimum(np.arange(K + 1), 2)]
+            # les termes de la série de Burnol, pour m = 1, ..., M
+            terms = np.zeros((b, K + 1, M))
+            for i in range(3):
+                if i <= K:
+                    terms[:, i:, :] += (ub[:, :K + 1 - i, 1:]
+                                        * beta[:, i, None, 1:])
+            # le terme correctif, sommé du plus petit terme au plus grand,
+            # est retiré (série alternée) ou ajouté (série positive)
+            if positive:
+                S[b] = Sb + terms[:, :, ::-1].sum(axis=2)
+            else:
+                signs = (-1.) ** np.arange(M)             # +1, -1, +1, ...
+                S[b] = Sb - (terms * signs)[:, :, ::-1].sum(axis=2)
+    return S
+
+
+def irwinfloatgridtest():
+    """Comparaison de irwinfloatgrid() avec irwinfloat() et irwinposfloat()
+    """
+    from irwinfloat_legacy import irwinfloat, irwinposfloat
+
+    bases = list(range(2, 17))
+    for positive, f in ((False, irwinfloat), (True, irwinposfloat)):
+        S = irwinfloatgrid(bases, 6, positive)
+        for b in bases:
+            for d in range(b):
+                for k in range(7):
+                    x = f(b, d, k)
+                    assert abs(S[b][d][k] - x) <= 1e-13 * abs(x) + 1e-300,\
+                        "problème avec b=%s, d=%s, k=%s, %s" % (
+                            b, d, k, "série positive" if positive
+                            else "série alternée")
+
+
+if __name__ == "__main__":
+    print("""Utilisez l'option -i de python si python quitte immédiatement!
+
+irwinfloatgrid(bases, K):
+   calcule suivant l'algorithme de Burnol les sommes d'Irwin des
+   1/n pour n ayant en base b le chiffre d présent exactement k fois,
+   pour toutes les bases b de la liste bases, tous les chiffres d et
+   tous les k <= K.  Renvoie S tel que S[b][d][k] est la somme.
+
+irwinfloatgrid(bases, K, positive=True) utilise la série positive de
+Burnol et non pas sa série alternée.
+
+*Comme pour irwinfloat(), le dernier chiffre et même les deux derniers sont
+sans signification.*"""
+    )